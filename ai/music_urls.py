@@ -0,0 +1,12 @@
+"""
+URL patterns for the music recommendation mount.
+
+Only the music endpoint — mounting the full ai.urls under /api/music/
+duplicated the analyze route in the resolver for no benefit.
+"""
+from django.urls import path
+from .views import music_recommendations
+
+urlpatterns = [
+    path('recommend/', music_recommendations, name='music_recommendations'),
+]
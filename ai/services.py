@@ -1,38 +1,370 @@
 """
 AI services for emotion analysis and music recommendations.
 """
-import requests
+import asyncio
+import hashlib
+import httpx
 import logging
+import string
+import threading
+import time
+from types import MappingProxyType
 from typing import Dict, List, Optional
 from django.conf import settings
+from django.core.cache import cache
+
+# Optional dependency for the semantic cache; emotion analysis still works
+# without it, we just lose near-duplicate matching.
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
 
 logger = logging.getLogger(__name__)
 
 
+# Shared async HTTP client, created lazily so importing this module doesn't
+# require a running event loop. Connection limits match the sync client pool.
+_async_client = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    timeout=10.0,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                )
+    return _async_client
+
+
+# Fallback advice templates by emotion, built once at import time
+ADVICE_TEMPLATES = {
+    'joy': "You're feeling great! Consider sharing this positive energy with others or engaging in activities you love.",
+    'sadness': "It's okay to feel sad sometimes. Try gentle activities like listening to music, taking a walk, or talking to someone you trust.",
+    'anger': "Take a moment to breathe deeply. Consider what's causing this feeling and whether there's a constructive way to address it.",
+    'fear': "Fear is natural. Break down what's worrying you into smaller, manageable steps. You're stronger than you think.",
+    'surprise': "Unexpected moments can be opportunities for growth. Take time to process what happened and how you feel about it.",
+    'disgust': "Strong negative feelings can be signals. Consider what boundaries you might need to set or changes you want to make.",
+    'anxious': "Try the 4-7-8 breathing technique: breathe in for 4, hold for 7, exhale for 8. Grounding exercises can also help.",
+    'stressed': "Take a 5-minute break. Try progressive muscle relaxation or a short walk. Remember that stress is temporary.",
+    'calm': "You're in a peaceful state. This is a great time for reflection, planning, or enjoying the present moment.",
+    'excited': "Channel this positive energy into something meaningful. Consider activities that align with your goals and values.",
+    'tired': "Rest is important for your wellbeing. Consider what your body and mind need - sleep, nutrition, or a mental break.",
+    'content': "Contentment is a beautiful state. Take a moment to appreciate what's going well in your life right now.",
+}
+
+# Map some HF emotion labels to our advice templates
+EMOTION_MAPPING = {
+    'admiration': 'joy',
+    'amusement': 'joy',
+    'approval': 'content',
+    'caring': 'joy',
+    'curiosity': 'excited',
+    'desire': 'excited',
+    'disappointment': 'sadness',
+    'disapproval': 'anger',
+    'embarrassment': 'anxious',
+    'excitement': 'excited',
+    'gratitude': 'content',
+    'grief': 'sadness',
+    'love': 'joy',
+    'nervousness': 'anxious',
+    'optimism': 'joy',
+    'pride': 'content',
+    'realization': 'surprise',
+    'relief': 'calm',
+    'remorse': 'sadness',
+    'confusion': 'anxious',
+}
+
+ADVICE_DISCLAIMER = " Remember, this is general wellness advice and not a substitute for professional mental health support."
+
+# Standalone disclaimer field returned alongside every analysis response
+DISCLAIMER = "This is general wellness advice and not a substitute for professional mental health support."
+
+# Flatten template lookup + disclaimer concatenation into one read-only dict
+# mapping every known label (template keys and HF aliases) straight to its
+# final advice string, so generate_advice is a single dict probe at runtime
+_FINAL_ADVICE = MappingProxyType({
+    label: ADVICE_TEMPLATES[EMOTION_MAPPING.get(label, label)] + ADVICE_DISCLAIMER
+    for label in set(ADVICE_TEMPLATES) | set(EMOTION_MAPPING)
+})
+
+_DEFAULT_ADVICE = (
+    "Take a moment to acknowledge your feelings. "
+    "Remember that all emotions are valid and temporary." + ADVICE_DISCLAIMER
+)
+
+
+class HFTokenBucket:
+    """
+    Process-local token bucket limiting calls to the HF API.
+
+    Smooths traffic bursts into a sustainable requests-per-minute rate so
+    we stop tripping upstream 429s (and the retry storms they cause)
+    before they happen. acquire() sleeps until a token is available.
+    """
+
+    def __init__(self, rpm):
+        self.rate = rpm / 60.0
+        self.capacity = float(rpm)
+        self.tokens = float(rpm)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until the bucket refills if empty."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self.last_update
+                self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+                self.last_update = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache for emotion queries.
+
+    Embeds incoming text with a small local sentence-transformer model and
+    returns the stored payload for the nearest prior query when the cosine
+    similarity clears the configured threshold. This catches rephrasings
+    ("I feel sad" vs "I'm sad today") that the exact-match cache misses.
+    Disabled (all lookups miss) when sentence-transformers isn't installed.
+    """
+
+    embedding_model = "all-MiniLM-L6-v2"
+
+    def __init__(self, max_entries=1024):
+        self.threshold = settings.SEM_CACHE_THRESHOLD
+        self.max_entries = max_entries
+        self._model = None
+        self._model_thread = None
+        self._entries = []  # list of (fp16 unit vector, payload)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return SentenceTransformer is not None
+
+    def _load_model(self):
+        try:
+            model = SentenceTransformer(self.embedding_model)
+        except Exception as e:
+            # One attempt; the cache just stays a miss-everything no-op
+            logger.warning("Semantic cache model load failed, cache disabled: %s", e)
+            return
+        self._model = model
+
+    def _model_ready(self):
+        """Kick off a background model load; True once it has finished.
+
+        The first SentenceTransformer construction can block for seconds
+        (or minutes, if the weights need downloading). Requests must never
+        pay that, so lookups and inserts simply miss until the load
+        completes off-thread.
+        """
+        if self._model is not None:
+            return True
+        with self._lock:
+            if self._model_thread is None:
+                self._model_thread = threading.Thread(
+                    target=self._load_model, name='semantic-cache-load', daemon=True
+                )
+                self._model_thread.start()
+        return False
+
+    def _embed(self, text):
+        vector = self._model.encode([text], normalize_embeddings=True)[0]
+        # fp16 halves the memory held per cached query
+        return vector.astype(np.float16)
+
+    def get(self, text: str) -> Optional[Dict]:
+        """Return the cached payload for the closest prior query, or None.
+
+        Never raises: the cache is an optimization, and a failure here must
+        degrade to a miss rather than break the caller's fallback contract.
+        """
+        if not self.enabled or not self._entries or not self._model_ready():
+            return None
+        try:
+            query = self._embed(text).astype(np.float32)
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+        with self._lock:
+            vectors = np.array([v for v, _ in self._entries], dtype=np.float32)
+            scores = vectors @ query
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                logger.info("HF semantic cache hit")
+                return dict(self._entries[best][1])
+        return None
+
+    def add(self, text: str, payload: Dict):
+        """Store a payload under the embedding of its query text.
+
+        Never raises — an embed failure only costs us a cache entry, not
+        the already-computed payload the caller is about to return.
+        """
+        if not self.enabled or not self._model_ready():
+            return
+        try:
+            vector = self._embed(text)
+        except Exception as e:
+            logger.warning("Semantic cache insert failed: %s", e)
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(0)
+            self._entries.append((vector, payload))
+
+
+# Trivial single-word inputs whose emotion is deterministic; answering these
+# locally saves a full HF roundtrip (and a quota token) per request.
+_KEYWORD_EMOTION = MappingProxyType({
+    'happy': 'joy',
+    'glad': 'joy',
+    'great': 'joy',
+    'good': 'joy',
+    'sad': 'sadness',
+    'down': 'sadness',
+    'tired': 'sadness',
+    'angry': 'anger',
+    'mad': 'anger',
+    'scared': 'fear',
+    'afraid': 'fear',
+    'anxious': 'fear',
+    'wow': 'surprise',
+    'ok': 'neutral',
+    'okay': 'neutral',
+    'fine': 'neutral',
+    'meh': 'neutral',
+})
+
+_STRIP_CHARS = string.punctuation + string.whitespace
+
+
+def fast_path_emotion(text: str) -> Optional[Dict]:
+    """
+    Resolve trivial inputs locally without an HF call.
+
+    Single-word texts either match the keyword table or get a
+    deterministic neutral result — a model roundtrip adds nothing for
+    "ok" or an emoji. Returns None when the text deserves real analysis.
+    """
+    normalized = text.lower().strip(_STRIP_CHARS)
+    label = _KEYWORD_EMOTION.get(normalized)
+    if label is not None:
+        return {'label': label, 'score': 0.8, 'fast_path': True}
+    if len(text.split()) < 2:
+        return {'label': 'neutral', 'score': 0.5, 'fast_path': True}
+    return None
+
+
+class HFBatcher:
+    """
+    Coalesces concurrent emotion requests into one HF inference call.
+
+    The HF models endpoint accepts a list of inputs per request, so calls
+    that pile up while a batch is in flight are drained together, sharing
+    one POST and its TLS/base-latency overhead. A lone request is
+    dispatched immediately — batching never adds latency to idle traffic.
+    """
+
+    max_batch = 16
+
+    def __init__(self, client):
+        self.client = client
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, text: str) -> Optional[Dict]:
+        """Queue a text for analysis and wait for its emotion result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # (Re)bind to the current event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        while not self._queue.empty():
+            items = []
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            await self._send(items)
+
+    async def _send(self, items):
+        texts = [text for text, _ in items]
+        url = f"{self.client.base_url}/{self.client.emotion_model}"
+        try:
+            response = await self.client._post_hedged(url, {'inputs': texts})
+            response.raise_for_status()
+            result = response.json()
+            if not isinstance(result, list) or len(result) != len(items):
+                raise ValueError(f"Unexpected batch response shape: {result!r}")
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if len(items) > 1:
+            logger.info("HF batch of %d requests sent in one call", len(items))
+
+        # One list of {label, score} candidates comes back per input text
+        for (_, future), item_result in zip(items, result):
+            if not future.done():
+                future.set_result(self.client._extract_emotion(item_result))
+
+
 class HFClient:
     """Client for Hugging Face Inference API."""
-    
+
+    # Shared constants; kept as class attributes so existing callers and
+    # tests can keep reading them off instances.
+    advice_templates = ADVICE_TEMPLATES
+    emotion_mapping = EMOTION_MAPPING
+
     def __init__(self):
         self.api_token = settings.HUGGINGFACE_API_TOKEN
         self.emotion_model = "j-hartmann/emotion-english-distilroberta-base"
         self.base_url = "https://api-inference.huggingface.co/models"
-        
-        # Fallback advice templates by emotion
-        self.advice_templates = {
-            'joy': "You're feeling great! Consider sharing this positive energy with others or engaging in activities you love.",
-            'sadness': "It's okay to feel sad sometimes. Try gentle activities like listening to music, taking a walk, or talking to someone you trust.",
-            'anger': "Take a moment to breathe deeply. Consider what's causing this feeling and whether there's a constructive way to address it.",
-            'fear': "Fear is natural. Break down what's worrying you into smaller, manageable steps. You're stronger than you think.",
-            'surprise': "Unexpected moments can be opportunities for growth. Take time to process what happened and how you feel about it.",
-            'disgust': "Strong negative feelings can be signals. Consider what boundaries you might need to set or changes you want to make.",
-            'anxious': "Try the 4-7-8 breathing technique: breathe in for 4, hold for 7, exhale for 8. Grounding exercises can also help.",
-            'stressed': "Take a 5-minute break. Try progressive muscle relaxation or a short walk. Remember that stress is temporary.",
-            'calm': "You're in a peaceful state. This is a great time for reflection, planning, or enjoying the present moment.",
-            'excited': "Channel this positive energy into something meaningful. Consider activities that align with your goals and values.",
-            'tired': "Rest is important for your wellbeing. Consider what your body and mind need - sleep, nutrition, or a mental break.",
-            'content': "Contentment is a beautiful state. Take a moment to appreciate what's going well in your life right now.",
-        }
-    
+
+        # Pooled HTTP/2 client: successive calls multiplex over keep-alive
+        # connections instead of paying a fresh TCP+TLS handshake each, and
+        # the transport retries connection failures before giving up
+        self.client = httpx.Client(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+            transport=httpx.HTTPTransport(retries=2, http2=True),
+        )
+
+        # Coalesces concurrent async calls into one batched HF request
+        self.batcher = HFBatcher(self)
+
     def analyze_emotion(self, text: str) -> Dict:
         """
         Analyze emotion in text using Hugging Face API.
@@ -43,6 +375,10 @@ class HFClient:
         Returns:
             Dict with 'label' and 'score' keys, or fallback data if API fails
         """
+        fast = fast_path_emotion(text)
+        if fast is not None:
+            return fast
+
         if not self.api_token:
             logger.warning("Hugging Face API token not configured")
             return {
@@ -50,60 +386,170 @@ class HFClient:
                 'score': 0.5,
                 'ai_unavailable': True
             }
-        
+
+        # Identical text always yields the same emotion; serve repeats from cache
+        cache_key = self.cache_key(text)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("HF emotion cache hit")
+            return dict(cached)
+        logger.info("HF emotion cache miss")
+
+        # Fall back to near-duplicate matching before paying for an API call
+        semantic = semantic_cache.get(text)
+        if semantic is not None:
+            return semantic
+
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_token}',
-                'Content-Type': 'application/json'
-            }
-            
             payload = {'inputs': text}
             url = f"{self.base_url}/{self.emotion_model}"
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+
+            _hf_bucket.acquire()
+            response = self.client.post(url, headers=self._headers(), json=payload)
             response.raise_for_status()
-            
-            result = response.json()
-            
-            # Handle different response formats
-            if isinstance(result, list) and len(result) > 0:
-                if isinstance(result[0], list):
-                    # Format: [[{'label': 'LABEL_1', 'score': 0.9}]]
-                    emotions = result[0]
-                else:
-                    # Format: [{'label': 'LABEL_1', 'score': 0.9}]
-                    emotions = result
-                
-                # Get the highest confidence emotion
-                top_emotion = max(emotions, key=lambda x: x['score'])
-                
-                return {
-                    'label': top_emotion['label'].lower(),
-                    'score': round(top_emotion['score'], 3)
-                }
-            
-            # Fallback if unexpected format
-            return {
-                'label': 'neutral',
-                'score': 0.5,
-                'ai_unavailable': True
-            }
-            
-        except requests.exceptions.RequestException as e:
+
+            emotion = self._extract_emotion(response.json())
+            if emotion is None:
+                # Fallback if unexpected format
+                return self._unavailable()
+
+            cache.set(cache_key, emotion, timeout=settings.HF_CACHE_TTL)
+            semantic_cache.add(text, emotion)
+            return emotion
+
+        except httpx.HTTPError as e:
             logger.error(f"Hugging Face API error: {e}")
-            return {
-                'label': 'neutral',
-                'score': 0.5,
-                'ai_unavailable': True
-            }
+            return self._unavailable()
+        except Exception as e:
+            logger.error(f"Unexpected error in emotion analysis: {e}")
+            return self._unavailable()
+
+    async def analyze_emotion_async(self, text: str) -> Dict:
+        """
+        Async variant of analyze_emotion built on a shared httpx.AsyncClient.
+
+        Under an ASGI server this frees the worker to service other requests
+        while the HF round-trip is in flight, instead of blocking a whole
+        process per call.
+        """
+        fast = fast_path_emotion(text)
+        if fast is not None:
+            return fast
+
+        if not self.api_token:
+            logger.warning("Hugging Face API token not configured")
+            return self._unavailable()
+
+        cache_key = self.cache_key(text)
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            logger.info("HF emotion cache hit")
+            return dict(cached)
+        logger.info("HF emotion cache miss")
+
+        semantic = semantic_cache.get(text)
+        if semantic is not None:
+            return semantic
+
+        try:
+            emotion = await self.batcher.submit(text)
+        except httpx.HTTPError as e:
+            logger.error(f"Hugging Face API error: {e}")
+            return self._unavailable()
         except Exception as e:
             logger.error(f"Unexpected error in emotion analysis: {e}")
+            return self._unavailable()
+
+        if emotion is None:
+            return self._unavailable()
+
+        await cache.aset(cache_key, emotion, timeout=settings.HF_CACHE_TTL)
+        semantic_cache.add(text, emotion)
+        return emotion
+
+    async def _post_hedged(self, url: str, payload: Dict) -> httpx.Response:
+        """
+        POST with request hedging against HF's long tail latency.
+
+        If the primary request hasn't answered within HF_HEDGE_DELAY_S a
+        duplicate is fired and whichever returns first wins; the loser is
+        cancelled. Inference calls are idempotent, so duplicating them is
+        safe, and the duplicate dodges the sporadic multi-second stalls
+        that dominate p99.
+        """
+
+        async def post():
+            await asyncio.to_thread(_hf_bucket.acquire)
+            return await get_async_client().post(
+                url, headers=self._headers(), json=payload
+            )
+
+        async def delayed_post():
+            await asyncio.sleep(settings.HF_HEDGE_DELAY_S)
+            return await post()
+
+        done, pending = await asyncio.wait(
+            [asyncio.create_task(post()), asyncio.create_task(delayed_post())],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        try:
+            while True:
+                task = done.pop()
+                try:
+                    return task.result()
+                except Exception:
+                    # One attempt failed; fall back to the other if it's
+                    # still in flight, otherwise surface the error
+                    if not done and not pending:
+                        raise
+                    if not done:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _headers(self) -> Dict:
+        return {
+            'Authorization': f'Bearer {self.api_token}',
+            'Content-Type': 'application/json'
+        }
+
+    @staticmethod
+    def _extract_emotion(result) -> Optional[Dict]:
+        """Pick the top-confidence emotion out of the HF response, if any."""
+        # Handle different response formats
+        if isinstance(result, list) and len(result) > 0:
+            if isinstance(result[0], list):
+                # Format: [[{'label': 'LABEL_1', 'score': 0.9}]]
+                emotions = result[0]
+            else:
+                # Format: [{'label': 'LABEL_1', 'score': 0.9}]
+                emotions = result
+
+            # Get the highest confidence emotion
+            top_emotion = max(emotions, key=lambda x: x['score'])
+
             return {
-                'label': 'neutral',
-                'score': 0.5,
-                'ai_unavailable': True
+                'label': top_emotion['label'].lower(),
+                'score': round(top_emotion['score'], 3)
             }
-    
+        return None
+
+    @staticmethod
+    def _unavailable() -> Dict:
+        return {
+            'label': 'neutral',
+            'score': 0.5,
+            'ai_unavailable': True
+        }
+
+    def cache_key(self, text: str) -> str:
+        """Build a cache key from the model name and the exact input text."""
+        digest = hashlib.sha256(f"{self.emotion_model}|{text}".encode()).hexdigest()
+        return f"hf:emo:{digest}"
+
     def generate_advice(self, emotion_label: str, text: str = "") -> str:
         """
         Generate advice based on detected emotion.
@@ -115,120 +561,94 @@ class HFClient:
         Returns:
             Advice string
         """
-        # Normalize emotion label
-        emotion_key = emotion_label.lower()
-        
-        # Map some HF emotion labels to our advice templates
-        emotion_mapping = {
-            'admiration': 'joy',
-            'amusement': 'joy',
-            'approval': 'content',
-            'caring': 'joy',
-            'curiosity': 'excited',
-            'desire': 'excited',
-            'disappointment': 'sadness',
-            'disapproval': 'anger',
-            'embarrassment': 'anxious',
-            'excitement': 'excited',
-            'gratitude': 'content',
-            'grief': 'sadness',
-            'love': 'joy',
-            'nervousness': 'anxious',
-            'optimism': 'joy',
-            'pride': 'content',
-            'realization': 'surprise',
-            'relief': 'calm',
-            'remorse': 'sadness',
-            'confusion': 'anxious',
-        }
-        
-        # Get mapped emotion or use original
-        advice_key = emotion_mapping.get(emotion_key, emotion_key)
-        
-        # Get advice template
-        advice = self.advice_templates.get(
-            advice_key,
-            "Take a moment to acknowledge your feelings. Remember that all emotions are valid and temporary."
-        )
-        
-        # Add disclaimer
-        disclaimer = " Remember, this is general wellness advice and not a substitute for professional mental health support."
-        
-        return advice + disclaimer
+        return _FINAL_ADVICE.get(emotion_label.lower(), _DEFAULT_ADVICE)
+
+
+# Hardcoded playlist recommendations by mood
+MOOD_PLAYLISTS = {
+    'happy': [
+        {'title': 'Feel Good Hits', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX3rxVfibe1L0'},
+        {'title': 'Happy Pop', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdPec7aLTmlC'},
+    ],
+    'sad': [
+        {'title': 'Sad Songs', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX7qK8ma5wgG1'},
+        {'title': 'Melancholy Indie', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWX83CujKHHOn'},
+    ],
+    'anxious': [
+        {'title': 'Calm & Peaceful', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
+        {'title': 'Focus Flow', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWZeKCadgRdKQ'},
+    ],
+    'stressed': [
+        {'title': 'Stress Relief', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
+        {'title': 'Ambient Relaxation', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0SM0LYsmbMT'},
+    ],
+    'calm': [
+        {'title': 'Peaceful Piano', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
+        {'title': 'Nature Sounds', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
+    ],
+    'excited': [
+        {'title': 'Energy Boost', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX76Wlfdnj7AP'},
+        {'title': 'Upbeat Pop', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdPec7aLTmlC'},
+    ],
+    'angry': [
+        {'title': 'Anger Management', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
+        {'title': 'Calming Classical', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
+    ],
+    'energetic': [
+        {'title': 'Workout Hits', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX76Wlfdnj7AP'},
+        {'title': 'High Energy', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdxcBWuJkbcy'},
+    ],
+    'tired': [
+        {'title': 'Gentle Acoustic', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0XUsuxWHRQd'},
+        {'title': 'Soft Rock', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWXRqgorJj26U'},
+    ],
+    'content': [
+        {'title': 'Chill Vibes', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0XUsuxWHRQd'},
+        {'title': 'Sunday Morning', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
+    ],
+}
+
+# Map some emotions to mood categories
+EMOTION_TO_MOOD = {
+    'joy': 'happy',
+    'sadness': 'sad',
+    'fear': 'anxious',
+    'anger': 'angry',
+    'surprise': 'excited',
+    'disgust': 'angry',
+}
+
+# Flatten mood names and emotion aliases into one read-only lookup that maps
+# every key directly to its playlist list, with the fallback bound once
+_MOOD_LOOKUP = MappingProxyType({
+    **MOOD_PLAYLISTS,
+    **{emotion: MOOD_PLAYLISTS[mood] for emotion, mood in EMOTION_TO_MOOD.items()},
+})
+
+_DEFAULT_PLAYLISTS = MOOD_PLAYLISTS['calm']
 
 
 class SpotifyRecommendationService:
     """Service for music recommendations based on mood."""
-    
-    def __init__(self):
-        # Hardcoded playlist recommendations by mood
-        self.mood_playlists = {
-            'happy': [
-                {'title': 'Feel Good Hits', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX3rxVfibe1L0'},
-                {'title': 'Happy Pop', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdPec7aLTmlC'},
-            ],
-            'sad': [
-                {'title': 'Sad Songs', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX7qK8ma5wgG1'},
-                {'title': 'Melancholy Indie', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWX83CujKHHOn'},
-            ],
-            'anxious': [
-                {'title': 'Calm & Peaceful', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
-                {'title': 'Focus Flow', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWZeKCadgRdKQ'},
-            ],
-            'stressed': [
-                {'title': 'Stress Relief', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
-                {'title': 'Ambient Relaxation', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0SM0LYsmbMT'},
-            ],
-            'calm': [
-                {'title': 'Peaceful Piano', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
-                {'title': 'Nature Sounds', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
-            ],
-            'excited': [
-                {'title': 'Energy Boost', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX76Wlfdnj7AP'},
-                {'title': 'Upbeat Pop', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdPec7aLTmlC'},
-            ],
-            'angry': [
-                {'title': 'Anger Management', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX4sWSpwq3LiO'},
-                {'title': 'Calming Classical', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
-            ],
-            'energetic': [
-                {'title': 'Workout Hits', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX76Wlfdnj7AP'},
-                {'title': 'High Energy', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DXdxcBWuJkbcy'},
-            ],
-            'tired': [
-                {'title': 'Gentle Acoustic', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0XUsuxWHRQd'},
-                {'title': 'Soft Rock', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWXRqgorJj26U'},
-            ],
-            'content': [
-                {'title': 'Chill Vibes', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DX0XUsuxWHRQd'},
-                {'title': 'Sunday Morning', 'url': 'https://open.spotify.com/playlist/37i9dQZF1DWU0ScTcjJBdj'},
-            ],
-        }
-    
+
+    mood_playlists = MOOD_PLAYLISTS
+    emotion_to_mood = EMOTION_TO_MOOD
+
     def get_recommendations(self, mood: str) -> List[Dict]:
         """
         Get music recommendations for a given mood.
-        
+
         Args:
             mood: Mood string
-            
+
         Returns:
             List of playlist dictionaries with 'title' and 'url'
         """
-        mood_key = mood.lower()
-        
-        # Map some emotions to mood categories
-        emotion_to_mood = {
-            'joy': 'happy',
-            'sadness': 'sad',
-            'fear': 'anxious',
-            'anger': 'angry',
-            'surprise': 'excited',
-            'disgust': 'angry',
-        }
-        
-        # Get mapped mood or use original
-        playlist_key = emotion_to_mood.get(mood_key, mood_key)
-        
-        # Return playlists or default calm playlists
-        return self.mood_playlists.get(playlist_key, self.mood_playlists['calm'])
\ No newline at end of file
+        return _MOOD_LOOKUP.get(mood.lower(), _DEFAULT_PLAYLISTS)
+
+
+# Shared instances so the hot request path doesn't rebuild clients per call
+_hf_bucket = HFTokenBucket(rpm=settings.HF_RPM_LIMIT)
+semantic_cache = SemanticCache()
+hf_client = HFClient()
+spotify_service = SpotifyRecommendationService()
\ No newline at end of file
@@ -1,9 +1,11 @@
 """
 Tests for AI services and views.
 """
-import responses
-from django.test import TestCase
+import httpx
+from datetime import date
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.urls import reverse
 from django.conf import settings
 from rest_framework.test import APITestCase
@@ -11,143 +13,156 @@ from rest_framework import status
 from unittest.mock import patch
 from .services import HFClient, SpotifyRecommendationService
 
+# Deterministic result the API tests get instead of a real HF roundtrip
+STUB_EMOTION = {'label': 'joy', 'score': 0.9}
+
 
 class HFClientTestCase(TestCase):
     """Test Hugging Face client functionality."""
-    
+
     def setUp(self):
+        cache.clear()
         self.hf_client = HFClient()
-    
-    @responses.activate
-    def test_analyze_emotion_success(self):
-        """Test successful emotion analysis."""
-        # Mock HF API response
-        responses.add(
-            responses.POST,
-            f"{self.hf_client.base_url}/{self.hf_client.emotion_model}",
-            json=[[{'label': 'joy', 'score': 0.95}]],
-            status=200
-        )
-        
+        # Don't depend on HUGGINGFACE_API_TOKEN being set in the
+        # environment — without it analyze_emotion short-circuits to the
+        # unavailable fallback before reaching the mock transport
+        self.hf_client.api_token = 'test-token'
+
+    def test_analyze_emotion_wire_format(self):
+        """Smoke test the real request/response wire format against a mock."""
+        def handler(request):
+            self.assertEqual(
+                str(request.url),
+                f"{self.hf_client.base_url}/{self.hf_client.emotion_model}"
+            )
+            return httpx.Response(200, json=[[{'label': 'joy', 'score': 0.95}]])
+
+        self.hf_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+
         result = self.hf_client.analyze_emotion("I'm feeling amazing today!")
-        
+
         self.assertEqual(result['label'], 'joy')
         self.assertEqual(result['score'], 0.95)
         self.assertNotIn('ai_unavailable', result)
-    
+
     def test_analyze_emotion_no_token(self):
         """Test emotion analysis without API token."""
         with patch.object(self.hf_client, 'api_token', None):
             result = self.hf_client.analyze_emotion("Test text")
-            
+
             self.assertEqual(result['label'], 'neutral')
             self.assertTrue(result['ai_unavailable'])
-    
+
     def test_generate_advice(self):
         """Test advice generation."""
         advice = self.hf_client.generate_advice('joy', 'I feel great!')
-        
+
         self.assertIn('positive energy', advice.lower())
         self.assertIn('wellness advice', advice)
 
 
 class SpotifyRecommendationServiceTestCase(TestCase):
     """Test Spotify recommendation service."""
-    
+
     def setUp(self):
         self.spotify_service = SpotifyRecommendationService()
-    
+
     def test_get_recommendations_happy(self):
         """Test getting recommendations for happy mood."""
         recommendations = self.spotify_service.get_recommendations('happy')
-        
+
         self.assertIsInstance(recommendations, list)
         self.assertGreater(len(recommendations), 0)
         self.assertIn('title', recommendations[0])
         self.assertIn('url', recommendations[0])
-    
+
     def test_get_recommendations_unknown_mood(self):
         """Test getting recommendations for unknown mood returns calm playlists."""
         recommendations = self.spotify_service.get_recommendations('unknown_mood')
-        
+
         self.assertIsInstance(recommendations, list)
         self.assertGreater(len(recommendations), 0)
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class AIAnalysisAPITestCase(APITestCase):
-    """Test AI analysis API endpoints."""
-    
+    """Test AI analysis API endpoints.
+
+    HFClient.analyze_emotion is stubbed with a constant result so these
+    tests never touch the HTTP stack; the wire format is covered once by
+    HFClientTestCase above.
+    """
+
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         self.client.force_authenticate(user=self.user)
-    
-    @responses.activate
+
+        patcher = patch.object(
+            HFClient, 'analyze_emotion', return_value=dict(STUB_EMOTION)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_analyze_emotion_success(self):
         """Test successful emotion analysis API call."""
-        # Mock HF API response
-        responses.add(
-            responses.POST,
-            "https://api-inference.huggingface.co/models/j-hartmann/emotion-english-distilroberta-base",
-            json=[[{'label': 'joy', 'score': 0.95}]],
-            status=200
-        )
-        
         url = reverse('analyze_emotion')
         data = {
             'text': "I'm feeling amazing today!",
             'persist': True
         }
         response = self.client.post(url, data, format='json')
-        
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('emotion', response.data)
         self.assertIn('advice', response.data)
         self.assertIn('music_recommendations', response.data)
         self.assertIn('mood_log_id', response.data)
-        
+
         # Check AI call was incremented
         self.user.profile.refresh_from_db()
         self.assertEqual(self.user.profile.daily_ai_calls, 1)
-    
+
     def test_analyze_emotion_quota_exceeded(self):
         """Test AI analysis when quota is exceeded."""
-        # Set user to max free calls
+        # Set user to max free calls, already reset today
         profile = self.user.profile
         profile.daily_ai_calls = settings.FREE_DAILY_AI_CALLS
+        profile.last_ai_calls_reset = date.today()
         profile.save()
-        
+
         url = reverse('analyze_emotion')
         data = {'text': "Test text"}
         response = self.client.post(url, data, format='json')
-        
+
         self.assertEqual(response.status_code, status.HTTP_402_PAYMENT_REQUIRED)
         self.assertIn('Daily AI limit reached', response.data['detail'])
-    
+
     def test_analyze_emotion_missing_text(self):
         """Test analysis without text."""
         url = reverse('analyze_emotion')
         data = {}
         response = self.client.post(url, data, format='json')
-        
+
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-    
+
     def test_music_recommendations(self):
         """Test music recommendations endpoint."""
         url = reverse('music_recommendations')
         response = self.client.get(url, {'mood': 'happy'})
-        
+
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['mood'], 'happy')
         self.assertIn('playlists', response.data)
         self.assertIsInstance(response.data['playlists'], list)
-    
+
     def test_music_recommendations_missing_mood(self):
         """Test music recommendations without mood parameter."""
         url = reverse('music_recommendations')
         response = self.client.get(url)
-        
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
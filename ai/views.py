@@ -3,8 +3,11 @@ AI-powered views for emotion analysis and music recommendations.
 """
 import logging
 from datetime import date
-from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
 from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
@@ -12,70 +15,79 @@ from rest_framework.response import Response
 from rest_framework.throttling import UserRateThrottle
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
-from .services import HFClient, SpotifyRecommendationService
+from .services import DISCLAIMER, fast_path_emotion, hf_client, spotify_service
 from moods.models import MoodLog
+from users.models import ME_PAYLOAD_CACHE_KEY, UserProfile
 
 logger = logging.getLogger(__name__)
 
 
-def ensure_daily_reset(user):
+def get_profile(user):
     """
-    Ensure user's daily AI calls are reset if it's a new day.
-    
+    Fetch the quota-relevant profile fields for a user in one query.
+
     Args:
         user: User instance
+
+    Returns:
+        UserProfile instance with only the quota fields loaded
     """
-    profile = user.profile
-    today = date.today()
-    
-    if not profile.last_ai_calls_reset or profile.last_ai_calls_reset < today:
-        profile.daily_ai_calls = 0
-        profile.last_ai_calls_reset = today
-        profile.save(update_fields=['daily_ai_calls', 'last_ai_calls_reset'])
+    return UserProfile.objects.only(
+        'user', 'daily_ai_calls', 'last_ai_calls_reset', 'plan', 'premium_expires_at'
+    ).get(user_id=user.id)
 
 
-def check_ai_quota(user):
+def claim_ai_call(profile):
     """
-    Check if user has remaining AI calls for today.
-    
+    Claim one AI call from the profile's daily quota.
+
+    A single conditional UPDATE that resets the counter when the date has
+    rolled over, refuses the claim when the quota is exhausted, and
+    increments otherwise — all atomically on the database side (MySQL has
+    no UPDATE ... RETURNING, so the row count tells us whether the claim
+    succeeded).
+
     Args:
-        user: User instance
-        
+        profile: UserProfile instance
+
     Returns:
-        Tuple of (has_quota: bool, error_response: Response or None)
+        Tuple of (claimed: bool, error_response: Response or None)
     """
-    ensure_daily_reset(user)
-    profile = user.profile
-    
+    today = date.today()
+
     # Determine quota based on plan
     if profile.is_premium_active:
         max_calls = settings.PREMIUM_DAILY_AI_CALLS
     else:
         max_calls = settings.FREE_DAILY_AI_CALLS
-    
-    if profile.daily_ai_calls >= max_calls:
-        error_response = Response({
-            'detail': 'Daily AI limit reached. Upgrade to Premium for more calls.',
-            'current_calls': profile.daily_ai_calls,
-            'max_calls': max_calls,
-            'plan': profile.plan
-        }, status=status.HTTP_402_PAYMENT_REQUIRED)
-        return False, error_response
-    
-    return True, None
 
+    rolled_over = Q(last_ai_calls_reset__isnull=True) | Q(last_ai_calls_reset__lt=today)
 
-def increment_ai_calls(user):
-    """
-    Increment user's daily AI call count.
-    
-    Args:
-        user: User instance
-    """
-    with transaction.atomic():
-        profile = user.profile
-        profile.daily_ai_calls += 1
-        profile.save(update_fields=['daily_ai_calls'])
+    claimed = UserProfile.objects.filter(
+        Q(pk=profile.pk) & (rolled_over | Q(daily_ai_calls__lt=max_calls))
+    ).update(
+        daily_ai_calls=Case(
+            When(rolled_over, then=Value(1)),
+            default=F('daily_ai_calls') + 1,
+        ),
+        last_ai_calls_reset=today,
+    )
+
+    if claimed:
+        # The queryset .update() skips the UserProfile post_save receiver,
+        # so drop the cached /me payload here the same way
+        # Payment.process_success does — otherwise /me serves a stale
+        # remaining_ai_calls for up to the cache TTL
+        cache.delete(ME_PAYLOAD_CACHE_KEY.format(user_id=profile.user_id))
+        return True, None
+
+    error_response = Response({
+        'detail': 'Daily AI limit reached. Upgrade to Premium for more calls.',
+        'current_calls': profile.daily_ai_calls,
+        'max_calls': max_calls,
+        'plan': profile.plan
+    }, status=status.HTTP_402_PAYMENT_REQUIRED)
+    return False, error_response
 
 
 @extend_schema(
@@ -125,42 +137,67 @@ def increment_ai_calls(user):
 @throttle_classes([UserRateThrottle])
 def analyze_emotion(request):
     """Analyze emotion in text and provide recommendations."""
-    
-    # Check AI quota
-    has_quota, error_response = check_ai_quota(request.user)
-    if not has_quota:
-        return error_response
-    
-    # Get request data
-    text = request.data.get('text', '').strip()
+
+    # Get request data; most inputs arrive without surrounding whitespace,
+    # so only pay for the strip() allocation when one of the ends needs it
+    text = request.data.get('text') or ''
+    if text and (text[0].isspace() or text[-1].isspace()):
+        text = text.strip()
     user_mood = request.data.get('mood')
     persist = request.data.get('persist', False)
-    
+
     if not text:
         return Response({
             'detail': 'Text is required for analysis'
         }, status=status.HTTP_400_BAD_REQUEST)
-    
+
     if len(text) > 1000:
         return Response({
             'detail': 'Text cannot exceed 1000 characters'
         }, status=status.HTTP_400_BAD_REQUEST)
-    
+
+    # Trivial inputs are answered locally and don't consume a quota token;
+    # everything else claims one (profile fetched once for the request)
+    if fast_path_emotion(text) is None:
+        profile = get_profile(request.user)
+        has_quota, error_response = claim_ai_call(profile)
+        if not has_quota:
+            return error_response
+
     try:
-        # Analyze emotion
-        hf_client = HFClient()
-        emotion_result = hf_client.analyze_emotion(text)
-        
-        # Generate advice
-        advice = hf_client.generate_advice(emotion_result['label'], text)
-        
-        # Get music recommendations
-        spotify_service = SpotifyRecommendationService()
-        music_recommendations = spotify_service.get_recommendations(emotion_result['label'])
-        
-        # Increment AI call count
-        increment_ai_calls(request.user)
-        
+        # Repeated submissions of the same text get the full cached response
+        response_key = hf_client.cache_key(text) + ':resp'
+        response_data = cache.get(response_key)
+
+        if response_data is None:
+            # Analyze emotion
+            emotion_result = hf_client.analyze_emotion(text)
+
+            # Generate advice
+            advice = hf_client.generate_advice(emotion_result['label'], text)
+
+            # Get music recommendations
+            music_recommendations = spotify_service.get_recommendations(emotion_result['label'])
+
+            response_data = {
+                'emotion': {
+                    'label': emotion_result['label'],
+                    'score': emotion_result['score']
+                },
+                'advice': advice,
+                'music_recommendations': music_recommendations,
+                'disclaimer': DISCLAIMER,
+                'ai_unavailable': emotion_result.get('ai_unavailable', False)
+            }
+
+            if not response_data['ai_unavailable']:
+                cache.set(response_key, response_data, timeout=settings.HF_CACHE_TTL)
+        else:
+            logger.info("AI analysis response cache hit")
+            response_data = dict(response_data)
+            emotion_result = response_data['emotion']
+            advice = response_data['advice']
+
         # Optionally persist as mood log
         mood_log = None
         if persist:
@@ -173,21 +210,10 @@ def analyze_emotion(request):
                 detected_confidence=emotion_result['score'],
                 advice=advice
             )
-        
-        response_data = {
-            'emotion': {
-                'label': emotion_result['label'],
-                'score': emotion_result['score']
-            },
-            'advice': advice,
-            'music_recommendations': music_recommendations,
-            'disclaimer': 'This is general wellness advice and not a substitute for professional mental health support.',
-            'ai_unavailable': emotion_result.get('ai_unavailable', False)
-        }
-        
+
         if mood_log:
             response_data['mood_log_id'] = str(mood_log.id)
-        
+
         return Response(response_data, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -198,6 +224,11 @@ def analyze_emotion(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# Playlists are static data, so whole 200 responses are cached at the HTTP
+# layer for a day; Vary: Authorization keeps entries per-user so the cache
+# can't serve a response across authentication boundaries.
+@cache_page(60 * 60 * 24)
+@vary_on_headers('Authorization')
 @extend_schema(
     summary="Get music recommendations",
     description="Get curated music playlist recommendations based on mood",
@@ -241,7 +272,6 @@ def music_recommendations(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        spotify_service = SpotifyRecommendationService()
         playlists = spotify_service.get_recommendations(mood)
         
         return Response({
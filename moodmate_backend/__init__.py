@@ -0,0 +1,6 @@
+# Celery is optional: web-only deployments without the package installed
+# still boot, and tasks fall back to inline execution.
+try:
+    from .celery import app as celery_app
+except ImportError:
+    celery_app = None
@@ -0,0 +1,11 @@
+"""
+Celery application for MoodMate background tasks.
+"""
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'moodmate_backend.settings')
+
+app = Celery('moodmate_backend')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -0,0 +1,79 @@
+"""
+Middleware specializations that skip HTML-stack work on API requests.
+
+API clients authenticate with JWTs through DRF, so sessions, CSRF checks
+and the messages framework are pure overhead on every /api/ call. These
+subclasses short-circuit on API paths while behaving exactly like their
+parents for the admin and any other HTML views — and, being subclasses,
+they still satisfy the admin's middleware system checks.
+"""
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.functional import SimpleLazyObject
+
+API_PREFIX = '/api/'
+
+
+def _is_api_request(request):
+    return request.path.startswith(API_PREFIX)
+
+
+class APIExemptSessionMiddleware(SessionMiddleware):
+    """Give API requests an empty, never-persisted session."""
+
+    def process_request(self, request):
+        if _is_api_request(request):
+            request.session = self.SessionStore(None)
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        if _is_api_request(request):
+            return response
+        return super().process_response(request, response)
+
+
+class APIExemptCsrfViewMiddleware(CsrfViewMiddleware):
+    """Skip CSRF bookkeeping for token-authenticated API requests."""
+
+    def process_request(self, request):
+        if _is_api_request(request):
+            return None
+        return super().process_request(request)
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if _is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+    def process_response(self, request, response):
+        if _is_api_request(request):
+            return response
+        return super().process_response(request, response)
+
+
+class APIExemptAuthenticationMiddleware(AuthenticationMiddleware):
+    """Leave API authentication to DRF instead of the session backend."""
+
+    def process_request(self, request):
+        if _is_api_request(request):
+            request.user = SimpleLazyObject(AnonymousUser)
+            return
+        super().process_request(request)
+
+
+class APIExemptMessageMiddleware(MessageMiddleware):
+    """Skip message storage handling on API requests."""
+
+    def process_request(self, request):
+        if _is_api_request(request):
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        if _is_api_request(request):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,23 @@
+"""
+Custom DRF parsers.
+"""
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class ORJSONParser(BaseParser):
+    """
+    JSON parser backed by orjson.
+
+    Counterpart to ORJSONRenderer: request bodies decode in native code
+    instead of stdlib json, which matters on the create-heavy endpoints.
+    """
+
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -47,14 +47,16 @@ LOCAL_APPS = [
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
+# The APIExempt* variants skip session/CSRF/auth/messages work on /api/
+# paths, where DRF's JWT authentication makes them redundant
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'moodmate_backend.middleware.APIExemptSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'moodmate_backend.middleware.APIExemptCsrfViewMiddleware',
+    'moodmate_backend.middleware.APIExemptAuthenticationMiddleware',
+    'moodmate_backend.middleware.APIExemptMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -87,8 +89,15 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', '127.0.0.1'),
         'PORT': os.getenv('DB_PORT', '3306'),
+        # Persistent connections: reuse one MySQL connection across
+        # requests instead of a handshake per request, with health checks
+        # so a worker never picks up a dead one
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'charset': 'utf8mb4',
+            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            'isolation_level': 'read committed',
         },
     }
 }
@@ -124,8 +133,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework configuration
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'moodmate_backend.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'moodmate_backend.parsers.ORJSONParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -143,10 +158,17 @@ REST_FRAMEWORK = {
 
 # JWT Configuration
 SIMPLE_JWT = {
+    # Explicit algorithm/key skip simplejwt's per-request settings
+    # resolution when building the token backend
+    'ALGORITHM': 'HS256',
+    'SIGNING_KEY': SECRET_KEY,
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=24),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
-    'BLACKLIST_AFTER_ROTATION': True,
+    # The token_blacklist app is not installed, so rotation never wrote
+    # OutstandingToken/BlacklistedToken rows anyway; False makes that
+    # explicit instead of leaving dead config that implies otherwise
+    'BLACKLIST_AFTER_ROTATION': False,
 }
 
 # CORS Configuration
@@ -165,12 +187,35 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
 
+# Cache (Redis-backed when REDIS_URL is set, in-process fallback otherwise)
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Custom settings for external services
 HUGGINGFACE_API_TOKEN = os.getenv('HUGGINGFACE_API_TOKEN')
+HF_CACHE_TTL = int(os.getenv('HF_CACHE_TTL', '86400'))
+SEM_CACHE_THRESHOLD = float(os.getenv('SEM_CACHE_THRESHOLD', '0.92'))
+HF_RPM_LIMIT = int(os.getenv('HF_RPM_LIMIT', '60'))
+HF_HEDGE_DELAY_S = float(os.getenv('HF_HEDGE_DELAY_S', '1.5'))
 SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID')
 SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET')
 SPOTIFY_PLAYLISTS_JSON_URL = os.getenv('SPOTIFY_PLAYLISTS_JSON_URL')
 
+# Celery broker for background tasks; when unset, tasks run inline
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+
 INTASEND_TOKEN = os.getenv('INTASEND_TOKEN')
 INTASEND_PUBLISHABLE_KEY = os.getenv('INTASEND_PUBLISHABLE_KEY')
 INTASEND_TEST_MODE = os.getenv('INTASEND_TEST_MODE', 'True').lower() == 'true'
@@ -13,7 +13,7 @@ urlpatterns = [
     path('api/users/', include('users.urls')),
     path('api/moods/', include('moods.urls')),
     path('api/ai/', include('ai.urls')),
-    path('api/music/', include('ai.urls')),
+    path('api/music/', include('ai.music_urls')),
     path('api/payments/', include('payments.urls')),
     
     # API Documentation
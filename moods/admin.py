@@ -9,6 +9,8 @@ from .models import MoodLog
 class MoodLogAdmin(admin.ModelAdmin):
     list_display = ('user', 'mood', 'intensity', 'detected_emotion', 'detected_confidence', 'created_at')
     list_filter = ('mood', 'intensity', 'detected_emotion', 'created_at')
+    list_select_related = ('user',)
+    list_per_page = 50
     search_fields = ('user__username', 'user__email', 'mood', 'note')
     readonly_fields = ('id', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
@@ -25,8 +27,4 @@ class MoodLogAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
-    
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.select_related('user')
\ No newline at end of file
+    )
\ No newline at end of file
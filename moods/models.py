@@ -27,6 +27,9 @@ class MoodLog(models.Model):
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mood_logs')
+    # Denormalized copy of the owner's username so list reads stay on this
+    # table instead of joining users; filled automatically on save
+    username_snapshot = models.CharField(max_length=150, blank=True, default='')
     mood = models.CharField(max_length=30, choices=MOOD_CHOICES)
     intensity = models.IntegerField(
         default=5,
@@ -47,9 +50,22 @@ class MoodLog(models.Model):
         db_table = 'mood_logs'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', 'created_at']),
+            # Descending to match the list/cursor ordering, so MySQL 8 can
+            # serve WHERE user_id=? ORDER BY created_at DESC as an index
+            # seek instead of a filesort
+            models.Index(fields=['user', '-created_at'], name='mood_user_created_desc'),
             models.Index(fields=['mood']),
         ]
     
+    def save(self, *args, **kwargs):
+        if not self.username_snapshot and self.user_id:
+            self.username_snapshot = self.user.username
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return f"{self.user.username} - {self.mood} ({self.intensity}/10) - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.user.username} - {self.mood} ({self.intensity}/10) - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+# Precomputed membership set for create-path validation; a frozenset test
+# beats DRF's ChoiceField machinery on every POST
+MOOD_VALUES = frozenset(code for code, _ in MoodLog.MOOD_CHOICES)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Pagination classes for mood tracking endpoints.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class MoodLogCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the mood log timeline.
+
+    Page-number pagination makes MySQL scan and discard OFFSET rows, which
+    grows linearly as a user's history does. Seeking on created_at turns
+    every page into a range scan on the existing (user, created_at) index,
+    so deep pages cost the same as the first one.
+    """
+
+    ordering = '-created_at'
+    page_size = 20
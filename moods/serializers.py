@@ -2,13 +2,13 @@
 Serializers for mood tracking functionality.
 """
 from rest_framework import serializers
-from .models import MoodLog
+from .models import MoodLog, MOOD_VALUES
 
 
 class MoodLogSerializer(serializers.ModelSerializer):
     """Serializer for mood log entries."""
     
-    user = serializers.StringRelatedField(read_only=True)
+    user = serializers.CharField(source='username_snapshot', read_only=True)
     
     class Meta:
         model = MoodLog
@@ -26,15 +26,30 @@ class MoodLogSerializer(serializers.ModelSerializer):
         return value
 
 
-class MoodLogCreateSerializer(serializers.ModelSerializer):
-    """Serializer for creating mood log entries."""
-    
-    class Meta:
-        model = MoodLog
-        fields = ['mood', 'intensity', 'note']
-    
+class MoodLogCreateSerializer(serializers.Serializer):
+    """
+    Serializer for creating mood log entries.
+
+    Hand-written rather than a ModelSerializer: three explicit fields
+    skip the per-request model introspection and validator building on
+    the create hot path.
+    """
+
+    mood = serializers.CharField(max_length=30)
+    intensity = serializers.IntegerField(min_value=1, max_value=10, required=False, default=5)
+    note = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=1000)
+
+    def validate_mood(self, value):
+        """Validate mood against the precomputed choice set."""
+        if value not in MOOD_VALUES:
+            raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+        return value
+
     def validate_note(self, value):
         """Validate note length."""
         if value and len(value) > 1000:
             raise serializers.ValidationError("Note cannot exceed 1000 characters")
-        return value
\ No newline at end of file
+        return value
+
+    def create(self, validated_data):
+        return MoodLog.objects.create(**validated_data)
\ No newline at end of file
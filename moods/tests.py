@@ -1,7 +1,7 @@
 """
 Tests for mood tracking functionality.
 """
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase
@@ -9,6 +9,7 @@ from rest_framework import status
 from .models import MoodLog
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class MoodLogModelTestCase(TestCase):
     """Test MoodLog model functionality."""
     
@@ -45,6 +46,7 @@ class MoodLogModelTestCase(TestCase):
         self.assertEqual(str(mood_log), expected)
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class MoodLogAPITestCase(APITestCase):
     """Test mood log API endpoints."""
     
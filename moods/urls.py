@@ -2,10 +2,13 @@
 URL patterns for mood tracking endpoints.
 """
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from .views import MoodLogViewSet
 
-router = DefaultRouter()
+# SimpleRouter skips DefaultRouter's API root view and format-suffix
+# routes — drf-spectacular covers discovery, so they were dead weight in
+# the URL resolver
+router = SimpleRouter()
 router.register(r'', MoodLogViewSet, basename='moodlog')
 
 urlpatterns = [
@@ -2,14 +2,20 @@
 Views for mood tracking functionality.
 """
 from rest_framework import viewsets, status
+from rest_framework.fields import DateTimeField
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from .models import MoodLog
+from .pagination import MoodLogCursorPagination
 from .serializers import MoodLogSerializer, MoodLogCreateSerializer
 
+# Renders timestamps exactly as ModelSerializer does (current-timezone
+# conversion, Z suffix) for the hand-built create response below
+_datetime_field = DateTimeField()
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -34,14 +40,25 @@ class MoodLogViewSet(viewsets.ModelViewSet):
     
     serializer_class = MoodLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MoodLogCursorPagination
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['mood', 'intensity']
-    ordering_fields = ['created_at', 'intensity']
+    # Cursor pagination adopts the requested ordering, so only fields the
+    # cursor can page stably over belong here — intensity is heavily
+    # duplicated and unindexed, which would mean unstable pages and a
+    # filesort per page
+    ordering_fields = ['created_at']
     ordering = ['-created_at']
     
     def get_queryset(self):
         """Return mood logs for the current user only."""
-        return MoodLog.objects.filter(user=self.request.user)
+        # username_snapshot keeps the list self-contained on mood_logs —
+        # no user join — and only() trims the row to the serialized columns
+        return MoodLog.objects.filter(user=self.request.user).only(
+            'id', 'username_snapshot', 'mood', 'intensity', 'note',
+            'detected_emotion', 'detected_confidence', 'advice',
+            'created_at', 'updated_at',
+        )
     
     def get_serializer_class(self):
         """Use different serializer for creation."""
@@ -58,7 +75,19 @@ class MoodLogViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         mood_log = serializer.save(user=request.user)
-        
-        # Return full serializer with all fields
-        response_serializer = MoodLogSerializer(mood_log)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+
+        # Build the response directly from the fresh instance — a second
+        # serializer pass would only re-derive values already in hand
+        # (AI fields are always empty on a manual create)
+        return Response({
+            'id': str(mood_log.id),
+            'user': request.user.username,
+            'mood': mood_log.mood,
+            'intensity': mood_log.intensity,
+            'note': mood_log.note,
+            'detected_emotion': None,
+            'detected_confidence': None,
+            'advice': None,
+            'created_at': _datetime_field.to_representation(mood_log.created_at),
+            'updated_at': _datetime_field.to_representation(mood_log.updated_at),
+        }, status=status.HTTP_201_CREATED)
\ No newline at end of file
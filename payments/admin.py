@@ -27,6 +27,8 @@ class PlanAdmin(admin.ModelAdmin):
 class PaymentAdmin(admin.ModelAdmin):
     list_display = ('user', 'plan', 'amount_kes', 'status', 'provider_reference', 'created_at')
     list_filter = ('status', 'plan', 'created_at')
+    list_select_related = ('user', 'plan')
+    list_per_page = 50
     search_fields = ('user__username', 'user__email', 'provider_reference')
     readonly_fields = ('id', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
@@ -43,8 +45,4 @@ class PaymentAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
-    
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.select_related('user', 'plan')
\ No newline at end of file
+    )
\ No newline at end of file
@@ -2,10 +2,20 @@
 Payment and subscription models for MoodMate backend.
 """
 import uuid
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F
+from django.db.models.functions import Coalesce, Greatest, Now
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+# Plans change rarely (admin edits only), so checkout can serve them from
+# cache; the signal receivers below keep entries honest.
+PLAN_CACHE_KEY = 'plan:{code}'
+PLAN_CACHE_TTL = 300
+
 
 class Plan(models.Model):
     """Subscription plan model."""
@@ -26,6 +36,13 @@ class Plan(models.Model):
         return f"{self.name} - {self.price_kes} KES"
 
 
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def invalidate_plan_cache(sender, instance, **kwargs):
+    """Drop the cached plan whenever it is edited or removed."""
+    cache.delete(PLAN_CACHE_KEY.format(code=instance.code))
+
+
 class Payment(models.Model):
     """Payment transaction model."""
     
@@ -41,7 +58,10 @@ class Payment(models.Model):
     amount_kes = models.IntegerField()
     currency = models.CharField(max_length=3, default='KES')
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
-    provider_reference = models.CharField(max_length=255, blank=True, null=True)
+    # Unique so the webhook lookup is an index seek and one provider
+    # reference can never be attached to two payments; null stays
+    # allowed for checkouts that haven't reached IntaSend yet
+    provider_reference = models.CharField(max_length=255, blank=True, null=True, unique=True)
     checkout_payload = models.JSONField(blank=True, null=True)
     webhook_data = models.JSONField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -52,32 +72,52 @@ class Payment(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'status']),
-            models.Index(fields=['provider_reference']),
+            # Serves the payment history listing (Meta ordering) as an
+            # index seek, same rationale as the mood log index
+            models.Index(fields=['user', '-created_at'], name='payment_user_created_desc'),
         ]
     
     def __str__(self):
         return f"{self.user.username} - {self.plan.name} - {self.status}"
     
-    def process_success(self):
-        """Process successful payment and upgrade user."""
-        if self.status == 'SUCCESS':
-            return  # Already processed
-        
-        self.status = 'SUCCESS'
-        self.save(update_fields=['status', 'updated_at'])
-        
-        # Upgrade user to premium
-        profile = self.user.profile
-        profile.plan = 'PREMIUM'
-        
-        # Set expiration date
-        if profile.premium_expires_at and profile.premium_expires_at > timezone.now():
-            # Extend existing subscription
-            profile.premium_expires_at += timezone.timedelta(days=self.plan.duration_days)
-        else:
-            # New subscription
-            profile.premium_expires_at = timezone.now() + timezone.timedelta(days=self.plan.duration_days)
-        
-        # Reset AI calls for premium user
-        profile.daily_ai_calls = 0
-        profile.save()
\ No newline at end of file
+    def process_success(self, webhook_data=None):
+        """
+        Process successful payment and upgrade user.
+
+        Returns True when this call performed the transition, False when
+        the payment was already successful (e.g. a replayed webhook).
+        """
+        from users.models import UserProfile, ME_PAYLOAD_CACHE_KEY
+
+        update_kwargs = {'status': 'SUCCESS', 'updated_at': timezone.now()}
+        if webhook_data is not None:
+            update_kwargs['webhook_data'] = webhook_data
+
+        with transaction.atomic():
+            # The conditional UPDATE is the idempotency gate: whichever call
+            # flips the status first performs the upgrade, replays see zero
+            # rows and stop — no Python-level check-then-act race.
+            flipped = Payment.objects.filter(pk=self.pk).exclude(status='SUCCESS').update(**update_kwargs)
+            if not flipped:
+                return False  # Already processed
+            self.status = 'SUCCESS'
+            if webhook_data is not None:
+                self.webhook_data = webhook_data
+
+            # Upgrade the user in a single targeted UPDATE: extend an active
+            # subscription from its expiry, start a lapsed/new one from now
+            UserProfile.objects.filter(user_id=self.user_id).update(
+                plan='PREMIUM',
+                premium_expires_at=ExpressionWrapper(
+                    Greatest(Coalesce(F('premium_expires_at'), Now()), Now())
+                    + timezone.timedelta(days=self.plan.duration_days),
+                    output_field=models.DateTimeField(),
+                ),
+                daily_ai_calls=0,
+                updated_at=timezone.now(),
+            )
+
+        # Queryset .update() skips signals, so drop the cached /me payload
+        # here for the upgrade to show immediately
+        cache.delete(ME_PAYLOAD_CACHE_KEY.format(user_id=self.user_id))
+        return True
\ No newline at end of file
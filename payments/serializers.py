@@ -1,9 +1,15 @@
 """
 Serializers for payment and subscription functionality.
 """
+import re
 from rest_framework import serializers
 from .models import Plan, Payment
 
+# Kenyan mobile numbers: +2547XX/+2541XX (9 national digits) or the
+# local 07XX/01XX forms; the canonical +254 form we normalize to must
+# itself match so round-tripped values revalidate
+_PHONE_RE = re.compile(r'^(?:\+254|0)[17]\d{8}$')
+
 
 class PlanSerializer(serializers.ModelSerializer):
     """Serializer for subscription plans."""
@@ -36,8 +42,11 @@ class CheckoutRequestSerializer(serializers.Serializer):
     email = serializers.EmailField()
     
     def validate_phone(self, value):
-        """Validate phone number format."""
-        # Basic validation for Kenyan phone numbers
-        if not value.startswith(('07', '01', '+254')):
+        """Validate phone format and normalize to the canonical +254 form."""
+        if not _PHONE_RE.match(value):
             raise serializers.ValidationError("Please provide a valid Kenyan phone number")
+        # Downstream code (IntaSend payload, logging) gets one canonical
+        # form instead of re-munging the local variants
+        if value.startswith('0'):
+            value = '+254' + value[-9:]
         return value
\ No newline at end of file
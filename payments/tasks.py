@@ -0,0 +1,75 @@
+"""
+Background tasks for payment processing.
+"""
+import logging
+from functools import lru_cache
+from celery import shared_task
+from django.conf import settings
+from requests.exceptions import RequestException
+from .models import Payment
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _intasend_service():
+    """
+    Build the IntaSend client once per process.
+
+    The SDK import is deferred to first use so web workers that never
+    handle a checkout don't pay its load cost at boot, and the memoized
+    instance reuses one client across tasks instead of reconstructing it
+    per call. The SDK issues every call through the module-level
+    requests API — a fresh TCP+TLS handshake per checkout — so it gets a
+    pooled Session swapped in (Session.request is call-compatible with
+    requests.request) to keep warm connections to IntaSend.
+    """
+    import requests
+    from intasend import client as intasend_client
+    from intasend import APIService
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ))
+    intasend_client.requests = session
+
+    return APIService(
+        token=settings.INTASEND_TOKEN,
+        publishable_key=settings.INTASEND_PUBLISHABLE_KEY,
+        test=settings.INTASEND_TEST_MODE
+    )
+
+
+@shared_task(autoretry_for=(RequestException,), retry_backoff=True, max_retries=3)
+def create_intasend_checkout(payment_id, phone, email, redirect_url):
+    """
+    Create the IntaSend checkout for a pending payment.
+
+    Runs on a worker so the third-party roundtrip doesn't hold a web
+    worker; network errors retry with backoff instead of surfacing as a
+    user-facing 500. Returns the provider checkout payload.
+    """
+    payment = Payment.objects.select_related('plan').get(pk=payment_id)
+
+    service = _intasend_service()
+
+    checkout_response = service.collect.checkout(
+        amount=payment.amount_kes,
+        currency='KES',
+        email=email,
+        phone_number=phone,
+        api_ref=str(payment.id),
+        redirect_url=redirect_url,
+        comment=f"MoodMate {payment.plan.name} Subscription"
+    )
+
+    payment.provider_reference = checkout_response.get('id')
+    payment.checkout_payload = checkout_response
+    payment.save(update_fields=['provider_reference', 'checkout_payload', 'updated_at'])
+
+    return checkout_response
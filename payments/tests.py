@@ -0,0 +1,147 @@
+"""
+Tests for payment serializers and webhook processing.
+"""
+import json
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .models import Payment, Plan
+from .serializers import CheckoutRequestSerializer
+
+
+class CheckoutRequestSerializerTestCase(TestCase):
+    """Test checkout request validation and phone normalization."""
+
+    def _validate(self, phone):
+        serializer = CheckoutRequestSerializer(data={
+            'plan_code': 'PREMIUM_MONTHLY',
+            'phone': phone,
+            'email': 'test@example.com',
+        })
+        return serializer
+
+    def test_international_phone_accepted(self):
+        serializer = self._validate('+254712345678')
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['phone'], '+254712345678')
+
+    def test_local_phone_normalized(self):
+        for local, canonical in [
+            ('0712345678', '+254712345678'),
+            ('0112345678', '+254112345678'),
+        ]:
+            serializer = self._validate(local)
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            self.assertEqual(serializer.validated_data['phone'], canonical)
+
+    def test_normalized_phone_revalidates(self):
+        """The canonical form we emit must pass validation if resubmitted."""
+        serializer = self._validate('0712345678')
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer = self._validate(serializer.validated_data['phone'])
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_invalid_phone_rejected(self):
+        for phone in [
+            '+25471234567',    # one national digit short
+            '+2547123456789',  # one digit too many
+            '0812345678',      # not a 07/01 prefix
+            '712345678',       # missing prefix entirely
+            'not-a-phone',
+        ]:
+            serializer = self._validate(phone)
+            self.assertFalse(serializer.is_valid(), phone)
+            self.assertIn('phone', serializer.errors)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class IntaSendWebhookTestCase(TestCase):
+    """Test the IntaSend webhook handler end to end."""
+
+    def setUp(self):
+        # Dedupe keys and cached payloads must not leak between tests
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.plan = Plan.objects.create(
+            code='PREMIUM_MONTHLY',
+            name='Premium Monthly',
+            price_kes=500,
+            duration_days=30,
+        )
+        self.payment = Payment.objects.create(
+            user=self.user,
+            plan=self.plan,
+            amount_kes=self.plan.price_kes,
+            provider_reference='ref-123',
+        )
+        self.url = reverse('intasend_webhook')
+
+    def _post(self, payload):
+        return self.client.post(
+            self.url, json.dumps(payload), content_type='application/json'
+        )
+
+    def test_complete_webhook_flips_status_and_upgrades_profile(self):
+        response = self._post({
+            'id': 'ref-123',
+            'api_ref': str(self.payment.id),
+            'state': 'COMPLETE',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'SUCCESS')
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.plan, 'PREMIUM')
+        self.assertIsNotNone(self.user.profile.premium_expires_at)
+
+    def test_replayed_complete_webhook_is_deduplicated(self):
+        payload = {'id': 'ref-123', 'state': 'COMPLETE'}
+        first = self._post(payload)
+        self.assertEqual(first.status_code, 200)
+
+        replay = self._post(payload)
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay.json()['detail'], 'Already processed')
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'SUCCESS')
+
+    def test_unknown_payment_retry_gets_a_real_attempt(self):
+        """A 404 must release the dedupe key so a retry isn't swallowed."""
+        payload = {'id': 'no-such-ref', 'state': 'COMPLETE'}
+        first = self._post(payload)
+        self.assertEqual(first.status_code, 404)
+
+        # The retry may arrive after the checkout task has written the
+        # reference; it must be processed, not answered from the dedupe key
+        self.payment.provider_reference = 'no-such-ref'
+        self.payment.save(update_fields=['provider_reference', 'updated_at'])
+        retry = self._post(payload)
+        self.assertEqual(retry.status_code, 200)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'SUCCESS')
+
+    def test_failed_state_marks_payment_failed(self):
+        response = self._post({'id': 'ref-123', 'state': 'FAILED'})
+
+        self.assertEqual(response.status_code, 200)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.status, 'FAILED')
+
+    def test_malformed_payloads_rejected(self):
+        for payload in [
+            [1, 2, 3],          # not an object
+            {'id': 'ref-123'},  # missing state
+            {'state': 123},     # state not a string
+        ]:
+            response = self._post(payload)
+            self.assertEqual(response.status_code, 400, payload)
+
+    def test_missing_reference_rejected(self):
+        response = self._post({'state': 'COMPLETE'})
+        self.assertEqual(response.status_code, 400)
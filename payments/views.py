@@ -3,14 +3,15 @@ Views for payment and subscription management.
 """
 import logging
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
-from intasend import APIService
-from .models import Plan, Payment
+from .models import Plan, Payment, PLAN_CACHE_KEY, PLAN_CACHE_TTL
 from .serializers import PlanSerializer, PaymentSerializer, CheckoutRequestSerializer
+from .tasks import create_intasend_checkout
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,7 @@ class PlanListView(generics.ListAPIView):
                 'provider_reference': {'type': 'string'}
             }
         },
+        202: {'description': 'Checkout queued; poll the payment for its checkout_url'},
         400: {'description': 'Invalid request data'},
         404: {'description': 'Plan not found'}
     }
@@ -60,10 +62,16 @@ def create_checkout(request):
     phone = serializer.validated_data['phone']
     email = serializer.validated_data['email']
     
-    try:
-        # Get plan
-        plan = Plan.objects.get(code=plan_code, active=True)
-    except Plan.DoesNotExist:
+    # Get plan, from cache when possible — the catalog changes rarely and
+    # this lookup sits on every checkout
+    plan_cache_key = PLAN_CACHE_KEY.format(code=plan_code)
+    plan = cache.get(plan_cache_key)
+    if plan is None:
+        plan = Plan.objects.filter(code=plan_code, active=True).first()
+        if plan is not None:
+            cache.set(plan_cache_key, plan, timeout=PLAN_CACHE_TTL)
+
+    if plan is None:
         return Response({
             'detail': f'Plan {plan_code} not found or inactive'
         }, status=status.HTTP_404_NOT_FOUND)
@@ -76,39 +84,29 @@ def create_checkout(request):
             amount_kes=plan.price_kes,
             status='PENDING'
         )
-        
-        # Initialize IntaSend service
-        service = APIService(
-            token=settings.INTASEND_TOKEN,
-            publishable_key=settings.INTASEND_PUBLISHABLE_KEY,
-            test=settings.INTASEND_TEST_MODE
-        )
-        
-        # Create checkout
-        checkout_data = {
-            'amount': plan.price_kes,
-            'currency': 'KES',
-            'email': email,
-            'phone_number': phone,
-            'api_ref': str(payment.id),
-            'redirect_url': f"{request.build_absolute_uri('/')}payment-success/",
-            'comment': f"MoodMate {plan.name} Subscription"
-        }
-        
-        checkout_response = service.collect.checkout(**checkout_data)
-        
-        # Update payment with provider data
-        payment.provider_reference = checkout_response.get('id')
-        payment.checkout_payload = checkout_response
-        payment.save()
-        
+
+        redirect_url = f"{request.build_absolute_uri('/')}payment-success/"
+
+        if settings.CELERY_BROKER_URL:
+            # Hand the IntaSend roundtrip to a worker so the web process
+            # returns immediately; the frontend polls the payment for its
+            # checkout_url once the task lands
+            create_intasend_checkout.delay(str(payment.id), phone, email, redirect_url)
+            return Response({
+                'payment_id': str(payment.id),
+                'status': payment.status
+            }, status=status.HTTP_202_ACCEPTED)
+
+        # No broker configured: run the task body inline (previous behavior)
+        checkout_response = create_intasend_checkout(str(payment.id), phone, email, redirect_url)
+
         return Response({
             'payment_id': str(payment.id),
             'checkout_url': checkout_response.get('url'),
             'provider_reference': checkout_response.get('id'),
             'checkout_data': checkout_response
         }, status=status.HTTP_200_OK)
-        
+
     except Exception as e:
         logger.error(f"Error creating checkout: {e}")
         return Response({
@@ -123,7 +121,9 @@ class PaymentListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Payment.objects.filter(user=self.request.user)
+        # select_related joins the plan in one query instead of an extra
+        # SELECT per payment from the nested PlanSerializer
+        return Payment.objects.filter(user=self.request.user).select_related('plan')
     
     @extend_schema(
         summary="List user payments",
@@ -1,122 +1,156 @@
 """
 Webhook handlers for payment processing.
 """
-import json
 import logging
-from django.http import HttpResponse
+import uuid
+
+import fastjsonschema
+import orjson
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.utils.decorators import method_decorator
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from rest_framework import status
-from drf_spectacular.utils import extend_schema
 from .models import Payment
 
 logger = logging.getLogger(__name__)
 
-
-@extend_schema(
-    summary="IntaSend webhook",
-    description="Webhook endpoint for IntaSend payment status updates",
-    request={
-        'application/json': {
-            'type': 'object',
-            'properties': {
-                'id': {'type': 'string'},
-                'state': {'type': 'string'},
-                'api_ref': {'type': 'string'},
-                'amount': {'type': 'number'},
-                'currency': {'type': 'string'}
-            }
-        }
+# Compiled once at import — fastjsonschema code-generates a validator
+# function, so each request pays straight-line checks instead of a
+# schema walk. Mirrors the shape documented for the IntaSend callback.
+_validate_webhook = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'id': {'type': 'string'},
+        'api_ref': {'type': 'string'},
+        'state': {'type': 'string'},
+        'amount': {'type': 'number'},
+        'currency': {'type': 'string'},
     },
-    responses={
-        200: {'description': 'Webhook processed successfully'},
-        400: {'description': 'Invalid webhook data'},
-        404: {'description': 'Payment not found'}
-    }
-)
-@api_view(['POST'])
-@permission_classes([AllowAny])
+    'required': ['state'],
+})
+
+
 @csrf_exempt
+@require_http_methods(['POST'])
 def intasend_webhook(request):
     """
     Handle IntaSend webhook notifications for payment status updates.
+
+    Deliberately a plain Django view rather than a DRF one: the provider
+    posts JSON of known shape, so full content negotiation and the DRF
+    request wrapper buy nothing on this hot ingress path. orjson parses
+    the raw body directly.
     """
+    dedupe_key = None
     try:
         # Parse webhook data
-        webhook_data = request.data
-        logger.info(f"Received IntaSend webhook: {webhook_data}")
-        
+        webhook_data = orjson.loads(request.body)
+        if logger.isEnabledFor(logging.INFO):
+            # repr of the full payload is only built when INFO is live
+            logger.info("Received IntaSend webhook: %s", webhook_data)
+
+        try:
+            _validate_webhook(webhook_data)
+        except fastjsonschema.JsonSchemaException as e:
+            logger.warning("Malformed webhook payload rejected: %s", e)
+            return JsonResponse({
+                'detail': 'Invalid webhook data'
+            }, status=400)
+
         # Extract key fields
         provider_reference = webhook_data.get('id')
         api_ref = webhook_data.get('api_ref')
-        state = webhook_data.get('state', '').upper()
-        
+        # 'state' is guaranteed present as a string by the validator
+        state = webhook_data['state'].upper()
+
         if not provider_reference and not api_ref:
-            return Response({
+            return JsonResponse({
                 'detail': 'Missing payment reference in webhook data'
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Find payment record
-        payment = None
+            }, status=400)
+
+        # Provider retries of the same notification terminate on a single
+        # cache round-trip (add == SETNX) before touching the database;
+        # the atomic status UPDATE below remains the hard guarantee
+        if provider_reference:
+            dedupe_key = f"wh:intasend:{provider_reference}:{state}"
+            if not cache.add(dedupe_key, 1, timeout=600):
+                logger.info("Duplicate webhook for %s (%s) ignored", provider_reference, state)
+                return JsonResponse({'detail': 'Already processed'}, status=200)
+
+        # Find payment record — one round-trip matching either reference
+        # instead of two sequential lookups
+        q = Q()
         if api_ref:
             try:
-                payment = Payment.objects.get(id=api_ref)
-            except Payment.DoesNotExist:
+                q |= Q(pk=uuid.UUID(api_ref))
+            except (TypeError, ValueError):
+                # api_ref is free-form provider input; a non-UUID value
+                # just can't match our primary key
                 pass
-        
-        if not payment and provider_reference:
-            try:
-                payment = Payment.objects.get(provider_reference=provider_reference)
-            except Payment.DoesNotExist:
-                pass
-        
+        if provider_reference:
+            q |= Q(provider_reference=provider_reference)
+
+        # first() returns None on a miss instead of raising DoesNotExist,
+        # keeping the common retry-for-unknown-payment path exception-free
+        payment = Payment.objects.filter(q).select_related('plan').first() if q else None
+
         if not payment:
-            logger.warning(f"Payment not found for webhook: {webhook_data}")
-            return Response({
+            # Release the dedupe key: the checkout Celery task may not
+            # have written provider_reference yet, and a later retry
+            # must get a real attempt rather than "Already processed"
+            if dedupe_key:
+                cache.delete(dedupe_key)
+            logger.warning("Payment not found for webhook: %s", webhook_data)
+            return JsonResponse({
                 'detail': 'Payment not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # Check if already processed (idempotency)
-        if payment.status == 'SUCCESS' and state == 'COMPLETE':
-            logger.info(f"Payment {payment.id} already processed successfully")
-            return Response({'detail': 'Already processed'}, status=status.HTTP_200_OK)
-        
+            }, status=404)
+
         # Update payment with webhook data
+        webhook_data_unchanged = payment.webhook_data == webhook_data
         payment.webhook_data = webhook_data
-        
+
         # Process payment based on state
         if state in ['COMPLETE', 'COMPLETED', 'SUCCESS']:
-            payment.process_success()
-            logger.info(f"Payment {payment.id} processed successfully")
-            
+            # Idempotency lives in the conditional UPDATE inside
+            # process_success — no SELECT-then-act race under concurrent
+            # provider retries
+            if payment.process_success(webhook_data=webhook_data):
+                logger.info("Payment %s processed successfully", payment.id)
+            else:
+                logger.info("Payment %s already processed successfully", payment.id)
+                return JsonResponse({'detail': 'Already processed'}, status=200)
+
         elif state in ['FAILED', 'CANCELLED', 'EXPIRED']:
             payment.status = 'FAILED'
             payment.save(update_fields=['status', 'webhook_data', 'updated_at'])
-            logger.info(f"Payment {payment.id} marked as failed")
-        
+            logger.info("Payment %s marked as failed", payment.id)
+
         else:
-            # Update webhook data but keep status as pending
-            payment.save(update_fields=['webhook_data', 'updated_at'])
-            logger.info(f"Payment {payment.id} status unchanged: {state}")
-        
-        return Response({
+            # Update webhook data but keep status as pending; retries
+            # carrying an identical payload skip the UPDATE entirely
+            if not webhook_data_unchanged:
+                payment.save(update_fields=['webhook_data', 'updated_at'])
+            logger.info("Payment %s status unchanged: %s", payment.id, state)
+
+        return JsonResponse({
             'detail': 'Webhook processed successfully',
             'payment_id': str(payment.id),
             'status': payment.status
-        }, status=status.HTTP_200_OK)
-        
-    except json.JSONDecodeError:
+        }, status=200)
+
+    except orjson.JSONDecodeError:
         logger.error("Invalid JSON in webhook request")
-        return Response({
+        return JsonResponse({
             'detail': 'Invalid JSON data'
-        }, status=status.HTTP_400_BAD_REQUEST)
-        
+        }, status=400)
+
     except Exception as e:
-        logger.error(f"Error processing webhook: {e}")
-        return Response({
+        # Same release as the 404 path — a delivery that blew up was
+        # not processed, so its retries must not be swallowed
+        if dedupe_key:
+            cache.delete(dedupe_key)
+        logger.error("Error processing webhook: %s", e)
+        return JsonResponse({
             'detail': 'Internal server error processing webhook'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=500)
@@ -43,15 +43,20 @@ def create_plans():
         }
     ]
     
+    # One existence query plus one batched INSERT for whatever is missing,
+    # instead of a get_or_create pair per plan
+    existing = set(
+        Plan.objects.filter(code__in=[p['code'] for p in plans_data])
+        .values_list('code', flat=True)
+    )
+    to_create = [Plan(**p) for p in plans_data if p['code'] not in existing]
+    Plan.objects.bulk_create(to_create, ignore_conflicts=True)
+
     for plan_data in plans_data:
-        plan, created = Plan.objects.get_or_create(
-            code=plan_data['code'],
-            defaults=plan_data
-        )
-        if created:
-            print(f"Created plan: {plan.name}")
+        if plan_data['code'] in existing:
+            print(f"Plan already exists: {plan_data['name']}")
         else:
-            print(f"Plan already exists: {plan.name}")
+            print(f"Created plan: {plan_data['name']}")
 
 
 def create_demo_user():
@@ -99,25 +104,25 @@ def create_sample_mood_logs(user):
         ('calm', 8, 'Meditation session went well'),
     ]
     
-    # Create mood logs spread over last 14 days
+    # Build mood logs spread over last 14 days, AI analysis data included
+    # upfront on every third entry, and insert them in one batch
+    logs = []
     for i, (mood, intensity, note) in enumerate(sample_moods):
         created_at = timezone.now() - timedelta(days=13-i, hours=i*2)
-        
-        mood_log = MoodLog.objects.create(
+        with_ai = i % 3 == 0
+        logs.append(MoodLog(
             user=user,
+            username_snapshot=user.username,
             mood=mood,
             intensity=intensity,
             note=note,
-            created_at=created_at
-        )
-        
-        # Add some AI analysis data to a few entries
-        if i % 3 == 0:
-            mood_log.detected_emotion = mood
-            mood_log.detected_confidence = 0.85 + (i * 0.01)
-            mood_log.advice = f"Based on your {mood} mood, consider taking time for self-care."
-            mood_log.save()
-    
+            created_at=created_at,
+            detected_emotion=mood if with_ai else None,
+            detected_confidence=0.85 + (i * 0.01) if with_ai else None,
+            advice=f"Based on your {mood} mood, consider taking time for self-care." if with_ai else None,
+        ))
+    MoodLog.objects.bulk_create(logs, batch_size=500)
+
     print(f"Created {len(sample_moods)} sample mood logs for {user.username}")
 
 
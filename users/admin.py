@@ -21,6 +21,7 @@ class UserAdmin(BaseUserAdmin):
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'plan', 'daily_ai_calls', 'premium_expires_at', 'is_premium_active')
     list_filter = ('plan', 'premium_expires_at')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'user__email')
     readonly_fields = ('created_at', 'updated_at', 'is_premium_active', 'remaining_ai_calls')
     
@@ -0,0 +1,38 @@
+"""
+Authentication classes for API endpoints.
+"""
+import time
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication with a per-process validated-token cache.
+
+    Every API call otherwise re-parses the token header and re-runs the
+    HMAC verification. The signature of a given token never changes, so
+    a validated token is remembered keyed on the raw bytes and reused
+    until its own exp claim passes. The cache is bounded; when full it is
+    simply reset — entries rebuild at the cost of one verification each.
+    """
+
+    _cache_max_entries = 1024
+    _token_cache = {}
+
+    def get_validated_token(self, raw_token):
+        cached = self._token_cache.get(raw_token)
+        if cached is not None:
+            validated, exp = cached
+            if exp > time.time():
+                return validated
+            # pop() tolerates two threads racing to evict the same
+            # just-expired entry; del would 500 the loser with KeyError
+            self._token_cache.pop(raw_token, None)
+
+        validated = super().get_validated_token(raw_token)
+        exp = validated.payload.get('exp')
+        if exp:
+            if len(self._token_cache) >= self._cache_max_entries:
+                self._token_cache.clear()
+            self._token_cache[raw_token] = (validated, exp)
+        return validated
@@ -2,9 +2,30 @@
 User models for MoodMate backend.
 """
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
+# Cached serialized /me payload per user; short TTL, invalidated on
+# profile saves so subscription changes show up immediately
+ME_PAYLOAD_CACHE_KEY = 'user:{user_id}:profile_payload'
+ME_PAYLOAD_CACHE_TTL = 60
+
+# Quota limits resolved once on first use — remaining_ai_calls runs per
+# serialized profile, and LazySettings attribute lookup adds up there.
+# Read lazily rather than at import so settings are fully configured.
+_FREE_DAILY_AI_CALLS = None
+_PREMIUM_DAILY_AI_CALLS = None
+
+
+def _quota_limits():
+    global _FREE_DAILY_AI_CALLS, _PREMIUM_DAILY_AI_CALLS
+    if _FREE_DAILY_AI_CALLS is None:
+        from django.conf import settings
+        _FREE_DAILY_AI_CALLS = settings.FREE_DAILY_AI_CALLS
+        _PREMIUM_DAILY_AI_CALLS = settings.PREMIUM_DAILY_AI_CALLS
+    return _FREE_DAILY_AI_CALLS, _PREMIUM_DAILY_AI_CALLS
+
 
 class UserProfile(models.Model):
     """Extended user profile with subscription and quota information."""
@@ -40,13 +61,8 @@ class UserProfile(models.Model):
     @property
     def remaining_ai_calls(self):
         """Calculate remaining AI calls for today."""
-        from django.conf import settings
-        
-        if self.is_premium_active:
-            max_calls = settings.PREMIUM_DAILY_AI_CALLS
-        else:
-            max_calls = settings.FREE_DAILY_AI_CALLS
-            
+        free_limit, premium_limit = _quota_limits()
+        max_calls = premium_limit if self.is_premium_active else free_limit
         return max(0, max_calls - self.daily_ai_calls)
 
 
@@ -56,10 +72,13 @@ from django.dispatch import receiver
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
+    # get_or_create keeps this idempotent under fixture loads
     if created:
-        UserProfile.objects.create(user=instance)
+        profile, _ = UserProfile.objects.get_or_create(user=instance)
+        # Prime the one-to-one cache so serializing the fresh user (e.g.
+        # the registration response) doesn't re-SELECT the row just written
+        instance.profile = profile
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+@receiver(post_save, sender=UserProfile)
+def invalidate_me_payload_cache(sender, instance, **kwargs):
+    cache.delete(ME_PAYLOAD_CACHE_KEY.format(user_id=instance.user_id))
\ No newline at end of file
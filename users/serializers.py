@@ -30,12 +30,22 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profile information."""
-    
+
+    remaining_ai_calls = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfile
         fields = ('plan', 'premium_expires_at', 'daily_ai_calls', 'remaining_ai_calls', 'is_premium_active')
         read_only_fields = ('plan', 'premium_expires_at', 'daily_ai_calls')
 
+    def get_remaining_ai_calls(self, obj):
+        # Prefer the DB-annotated value when the view computed it in SQL;
+        # the model property covers every other caller
+        annotated = getattr(obj, 'remaining_ai_calls_db', None)
+        if annotated is not None:
+            return annotated
+        return obj.remaining_ai_calls
+
 
 class MeSerializer(serializers.ModelSerializer):
     """Serializer for current user information including profile."""
@@ -1,7 +1,7 @@
 """
 Tests for user authentication and profile management.
 """
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase
@@ -9,6 +9,9 @@ from rest_framework import status
 from .models import UserProfile
 
 
+# MD5 instead of PBKDF2's 600k iterations — password strength is
+# irrelevant to these tests and hashing dominates user setUp time
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class UserRegistrationTestCase(APITestCase):
     """Test user registration functionality."""
     
@@ -52,6 +55,7 @@ class UserRegistrationTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class UserLoginTestCase(APITestCase):
     """Test user login functionality."""
     
@@ -88,6 +92,7 @@ class UserLoginTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class UserProfileTestCase(APITestCase):
     """Test user profile functionality."""
     
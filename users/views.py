@@ -1,13 +1,20 @@
 """
 User views for authentication and profile management.
 """
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, Now
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from .models import ME_PAYLOAD_CACHE_KEY, ME_PAYLOAD_CACHE_TTL, UserProfile
 from .serializers import UserRegistrationSerializer, MeSerializer
 from drf_spectacular.utils import extend_schema
 
@@ -21,13 +28,23 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         responses={200: {"access": "string", "refresh": "string", "user": MeSerializer}}
     )
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            # Add user info to response
-            user = User.objects.get(username=request.data.get('username'))
-            user_serializer = MeSerializer(user)
-            response.data['user'] = user_serializer.data
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            # Same translation the stock view performs — a token problem
+            # is a 401, not a 500
+            raise InvalidToken(e.args[0])
+
+        # SimpleJWT already authenticated and loaded this user during
+        # validation; reuse it rather than re-querying by username. Its
+        # authenticate() lookup doesn't join the profile, so prime the
+        # one-to-one cache explicitly before MeSerializer embeds it
+        user = serializer.user
+        user.profile = UserProfile.objects.get(user_id=user.pk)
+        data = dict(serializer.validated_data)
+        data['user'] = MeSerializer(user).data
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -45,8 +62,12 @@ class RegisterView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-        
+        # One commit (and one fsync) for the User INSERT plus the
+        # profile row created by the post_save signal, instead of an
+        # autocommit transaction per write
+        with transaction.atomic():
+            user = serializer.save()
+
         # Return user info with tokens
         refresh = RefreshToken.for_user(user)
         user_serializer = MeSerializer(user)
@@ -65,14 +86,49 @@ class MeView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_object(self):
-        return self.request.user
-    
+        # Re-fetch with the profile joined — MeSerializer embeds it, and
+        # request.user alone would trigger a second SELECT. only() trims
+        # the row to the serialized columns (no password hash etc.), and
+        # the remaining-quota math rides along as a SQL expression instead
+        # of a per-request Python property evaluation
+        remaining = Greatest(
+            Case(
+                When(
+                    profile__plan='PREMIUM',
+                    profile__premium_expires_at__gt=Now(),
+                    then=Value(settings.PREMIUM_DAILY_AI_CALLS),
+                ),
+                default=Value(settings.FREE_DAILY_AI_CALLS),
+            ) - F('profile__daily_ai_calls'),
+            Value(0),
+        )
+        user = User.objects.select_related('profile').only(
+            'id', 'username', 'email', 'first_name', 'last_name', 'date_joined',
+            'profile__plan', 'profile__premium_expires_at',
+            'profile__daily_ai_calls', 'profile__last_ai_calls_reset',
+        ).annotate(remaining_ai_calls_db=remaining).get(pk=self.request.user.pk)
+        user.profile.remaining_ai_calls_db = user.remaining_ai_calls_db
+        return user
+
     @extend_schema(
         summary="Get current user profile",
         description="Retrieve current user information including subscription details"
     )
     def get(self, request, *args, **kwargs):
-        return super().get(request, *args, **kwargs)
+        # Serve the serialized payload from cache; the UserProfile
+        # post_save receiver invalidates it when the profile changes
+        cache_key = ME_PAYLOAD_CACHE_KEY.format(user_id=request.user.pk)
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = self.get_serializer(self.get_object()).data
+            cache.set(cache_key, payload, timeout=ME_PAYLOAD_CACHE_TTL)
+        return Response(payload)
+
+    def perform_update(self, serializer):
+        # Updates to User fields don't touch UserProfile, so drop the
+        # cached payload here as well
+        serializer.save()
+        cache.delete(ME_PAYLOAD_CACHE_KEY.format(user_id=self.request.user.pk))
 
 
 @extend_schema(